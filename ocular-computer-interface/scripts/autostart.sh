@@ -0,0 +1,6 @@
+#!/bin/bash
+# Start the headset UI at boot. boot.py puts a splash frame on the
+# framebuffer before importing anything heavy.
+# Pass --profile-startup to print the time spent in each startup phase.
+cd "$(dirname "$0")/../src" || exit 1
+exec python3 boot.py "$@"
@@ -0,0 +1,94 @@
+"""
+Fast boot entry point.
+
+Only the standard library is imported before the splash frame is on the
+framebuffer; numpy, cv2 and the controls are imported afterwards and the
+camera backends only once a mode needs them.
+Run with --profile-startup to print the time spent in every phase.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from settings import load_settings_or_defaults
+from display.splash import show_splash
+
+
+def process_age():
+    """
+    Seconds since this process was started by the kernel, from /proc
+    (10 ms resolution), or None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            starttime = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(0.0, uptime - starttime / os.sysconf("SC_CLK_TCK"))
+
+
+class StartupProfiler:
+    """
+    Wall-clock time per startup phase. The t= column is measured from process
+    start, so it includes interpreter startup and the imports of this module;
+    without /proc it falls back to the creation of the profiler.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        age = process_age()
+        now = time.perf_counter()
+        self.start = now - age if age is not None else now
+        self.phases = []
+        if age is not None:
+            self.phases.append(("interpreter + imports", age, age))
+
+    @contextmanager
+    def phase(self, name):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - begin, time.perf_counter() - self.start))
+
+    def mark(self, name):
+        """Record a milestone reached (no duration of its own)."""
+        self.phases.append((name, 0.0, time.perf_counter() - self.start))
+        if self.enabled and name == "first frame":
+            self.report()
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("--- Startup profile ---")
+        for name, duration, at in self.phases:
+            print(f"{name:<24} {duration * 1000:8.1f} ms   (t={at * 1000:8.1f} ms)")
+
+
+def boot(profile=False):
+    profiler = StartupProfiler(enabled=profile)
+
+    with profiler.phase("splash"):
+        show_splash(load_settings_or_defaults())
+
+    # Heavy imports, timed one by one
+    with profiler.phase("import numpy"):
+        import numpy  # noqa: F401
+    with profiler.phase("import cv2"):
+        import cv2  # noqa: F401
+    with profiler.phase("import controls"):
+        import controls.switch  # noqa: F401
+        import controls.rotary  # noqa: F401
+    # Camera backends are imported by main.create_camera() on first use
+    with profiler.phase("import main"):
+        import main
+
+    main.main(profiler=profiler)
+
+
+if __name__ == "__main__":
+    boot(profile="--profile-startup" in sys.argv)
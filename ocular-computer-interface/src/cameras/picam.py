@@ -3,7 +3,7 @@ from time import sleep
 import cv2
 
 class PiCam:
-    def __init__(self, camera_num=0, width=800, height=480):
+    def __init__(self, camera_num=0, width=800, height=480, warmup=0.2):
         self.picam = Picamera2(camera_num=camera_num)
 
         # Full sensor dimensions (IMX708)
@@ -21,7 +21,9 @@ class PiCam:
 
         self.picam.configure(self.config)
         self.picam.start()
-        sleep(0.2)
+        # Let auto-exposure settle; pass warmup=0 when the first frames may be dark
+        if warmup:
+            sleep(warmup)
 
         # Keep track of zoom level
         self.zoom_factor = 1.0  # 1.0 = no zoom
@@ -5,13 +5,25 @@ import adafruit_mlx90640
 import cv2
 
 class ThermalCam:
-    def __init__(self, width=800, height=480):
+    def __init__(self, width=800, height=480, colormap="TURBO", invert=True):
         i2c = busio.I2C(board.SCL, board.SDA, frequency=400000)
         self.mlx = adafruit_mlx90640.MLX90640(i2c)
         self.mlx.refresh_rate = adafruit_mlx90640.RefreshRate.REFRESH_4_HZ
         self.frame = np.zeros((24*32,))
         self.width = width
         self.height = height
+        self.set_colormap(colormap, invert)
+
+    def set_colormap(self, name="TURBO", invert=True):
+        """Precompute the 256-entry colour table (inversion folded in)."""
+        cmap = getattr(cv2, f"COLORMAP_{name.upper()}", None)
+        if cmap is None:
+            print(f"Unknown colormap {name}, using TURBO")
+            cmap = cv2.COLORMAP_TURBO
+        ramp = np.arange(256, dtype=np.uint8)
+        if invert:
+            ramp = 255 - ramp
+        self.lut = cv2.applyColorMap(ramp.reshape(256, 1), cmap)
 
     def capture(self):
         while True:
@@ -22,7 +34,6 @@ class ThermalCam:
                 continue
         img = np.reshape(self.frame, (24, 32))
         norm = cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
-        norm = 255 - norm
-        colormap = cv2.applyColorMap(norm, cv2.COLORMAP_TURBO)
+        colormap = cv2.applyColorMap(norm, self.lut)
         corrected = cv2.flip(colormap, 1)  # Fix left-right inversion
         return cv2.resize(corrected, (self.width, self.height), interpolation=cv2.INTER_NEAREST)
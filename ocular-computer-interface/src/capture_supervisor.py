@@ -0,0 +1,284 @@
+import importlib
+import threading
+import time
+import multiprocessing as mp
+
+from frame_ring import FrameRing
+
+# --- SETTINGS ---
+RING_SLOTS = 4
+MONITOR_INTERVAL = 0.5     # seconds between supervisor checks
+STARTUP_TIMEOUT = 10.0     # seconds a capture process may take to deliver its first frame
+STALL_TIMEOUT = 3.0        # seconds without a frame before a process is restarted
+RESTART_DELAY = 0.5        # first restart backoff, doubled on every consecutive crash
+RESTART_DELAY_MAX = 8.0
+
+# Capture processes are spawned, not forked: restarts happen from the monitor
+# thread while the render thread is inside cv2, and a forked child of a
+# multi-threaded process can deadlock in the camera stack. A spawned child
+# also starts clean, so only it ever loads the camera backends.
+MP_CONTEXT = mp.get_context("spawn")
+
+
+def capture_process(target, kwargs, ring_name, shape, slots, heartbeat, zoom):
+    """
+    Capture process entry point. The camera class is given as "module:Class"
+    and imported here, so the render process never loads the camera backends.
+    """
+    module_name, class_name = target.split(":")
+    cam_class = getattr(importlib.import_module(module_name), class_name)
+    cam = cam_class(**kwargs)
+    ring = FrameRing(name=ring_name, shape=shape, slots=slots)
+    current_zoom = 1.0
+
+    try:
+        while True:
+            if zoom.value != current_zoom and hasattr(cam, "set_zoom"):
+                current_zoom = zoom.value
+                cam.set_zoom(current_zoom)
+
+            frame = cam.capture()
+            if frame is not None:
+                ring.write(frame)
+            heartbeat.value = time.time()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if hasattr(cam, "stop"):
+            cam.stop()
+        ring.close()
+
+
+class CaptureSource:
+    """One capture process and the ring it writes into."""
+
+    def __init__(self, name, target, kwargs, shape, slots=RING_SLOTS):
+        self.name = name
+        self.target = target
+        self.kwargs = kwargs
+        self.shape = shape
+        self.slots = slots
+        self.ring = FrameRing(shape=shape, slots=slots, create=True)
+        self.heartbeat = MP_CONTEXT.Value("d", 0.0, lock=False)
+        self.zoom = MP_CONTEXT.Value("d", 1.0, lock=False)
+        self.process = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.restart_delay = RESTART_DELAY
+        self.next_start = 0.0
+
+    def start(self):
+        self.heartbeat.value = 0.0
+        self.started_at = time.time()
+        self.process = MP_CONTEXT.Process(
+            target=capture_process,
+            args=(self.target, self.kwargs, self.ring.name, self.shape,
+                  self.slots, self.heartbeat, self.zoom),
+            name=f"capture-{self.name}",
+            daemon=True,
+        )
+        self.process.start()
+
+    def stop(self):
+        if self.process and self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1.0)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        self.process = None
+
+    def is_stalled(self, now):
+        last = self.heartbeat.value
+        if last == 0.0:
+            return now - self.started_at > STARTUP_TIMEOUT
+        return now - last > STALL_TIMEOUT
+
+
+class CaptureSupervisor:
+    """
+    Runs every camera in its own process writing into a shared-memory ring.
+
+    The render process reads the newest frame of each source as a NumPy view
+    into shared memory. A monitor thread restarts capture processes that die
+    or stop delivering frames; the rings outlive the processes, so the display
+    keeps showing the last good frame while a camera comes back.
+    """
+
+    def __init__(self):
+        self.sources = {}
+        self._running = False
+        self._monitor = None
+
+    def add(self, name, target, kwargs, shape, slots=RING_SLOTS):
+        self.sources[name] = CaptureSource(name, target, kwargs, shape, slots)
+
+    def start(self):
+        for source in self.sources.values():
+            source.start()
+        self._running = True
+        self._monitor = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._monitor.start()
+
+    def _monitor_loop(self):
+        while self._running:
+            now = time.time()
+            for source in self.sources.values():
+                if source.process is None:
+                    if now >= source.next_start:
+                        source.start()
+                    continue
+
+                if not source.process.is_alive():
+                    reason = f"exited with code {source.process.exitcode}"
+                elif source.is_stalled(now):
+                    reason = "stalled"
+                else:
+                    if source.heartbeat.value:
+                        source.restart_delay = RESTART_DELAY  # healthy again, reset backoff
+                    continue
+
+                source.stop()
+                source.restarts += 1
+                source.next_start = now + source.restart_delay
+                print(f"[{source.name}] capture process {reason}, "
+                      f"restarting in {source.restart_delay:.1f}s")
+                source.restart_delay = min(RESTART_DELAY_MAX, source.restart_delay * 2)
+            time.sleep(MONITOR_INTERVAL)
+
+    def latest(self, name):
+        """
+        Newest frame of a source as a zero-copy view, or None.
+        Returns (view, lease); pass the lease to still_valid() after using the view.
+        """
+        latest = self.sources[name].ring.latest_view()
+        if latest is None:
+            return None, None
+        view, slot, seq, _ = latest
+        return view, (name, slot, seq)
+
+    def still_valid(self, *leases):
+        """True if none of the leased slots were overwritten while in use."""
+        for lease in leases:
+            if lease is None:
+                continue
+            name, slot, seq = lease
+            if not self.sources[name].ring.still_valid(slot, seq):
+                return False
+        return True
+
+    def count(self, name):
+        return self.sources[name].ring.count
+
+    def set_zoom(self, name, factor):
+        self.sources[name].zoom.value = factor
+
+    def stop(self):
+        self._running = False
+        if self._monitor:
+            self._monitor.join(timeout=2 * MONITOR_INTERVAL)
+        for source in self.sources.values():
+            source.stop()
+            source.ring.close()
+
+
+# --- Benchmark: threaded capture vs capture processes ---
+
+class SyntheticCam:
+    """
+    Stand-in camera for benchmarking. `python_work` pixels are decoded in a
+    pure Python loop, like the MLX90640 driver does over I2C, so the capture
+    holds the GIL; `interval` sleeps like a blocking camera read.
+    """
+
+    def __init__(self, width=800, height=480, interval=1 / 30, python_work=0):
+        import numpy as np
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.interval = interval
+        self.python_work = python_work
+        self.counter = 0
+
+    def capture(self):
+        time.sleep(self.interval)
+        acc = 0
+        for i in range(self.python_work):
+            acc = (acc + i * i) % 65521
+        self.counter += 1
+        self.frame[:] = self.counter % 256
+        return self.frame
+
+
+def _benchmark_render(read_frame, seconds):
+    import cv2
+    import numpy as np
+
+    map_x = np.random.uniform(0, 399, (480, 400)).astype(np.float32)
+    map_y = np.random.uniform(0, 479, (480, 400)).astype(np.float32)
+    intervals = []
+    last = time.perf_counter()
+    end = last + seconds
+    while last < end:
+        frame = read_frame()
+        if frame is not None:
+            half = cv2.resize(frame, (400, 480))
+            cv2.remap(half, map_x, map_y, interpolation=cv2.INTER_LINEAR)
+        now = time.perf_counter()
+        intervals.append(now - last)
+        last = now
+    return np.array(intervals)
+
+
+def benchmark(seconds=5.0):
+    """Render-loop jitter and capture throughput, threaded vs multi-process."""
+    import numpy as np
+
+    sources = {
+        "picam": {"width": 800, "height": 480, "interval": 1 / 30},
+        "thermal": {"width": 400, "height": 480, "interval": 1 / 4, "python_work": 400000},
+    }
+
+    def report(label, intervals, captured):
+        ms = intervals * 1000
+        print(f"{label:<10} render {len(ms) / seconds:6.1f} fps  "
+              f"mean {ms.mean():5.2f} ms  std {ms.std():5.2f} ms  "
+              f"p99 {np.percentile(ms, 99):6.2f} ms  max {ms.max():6.2f} ms  "
+              + "  ".join(f"{k} {v / seconds:.1f}/s" for k, v in captured.items()))
+
+    # Threaded, as in main_threads.py
+    frames = {}
+    counts = {name: 0 for name in sources}
+    running = True
+
+    def worker(name, kwargs):
+        cam = SyntheticCam(**kwargs)
+        while running:
+            frames[name] = cam.capture().copy()
+            counts[name] += 1
+
+    threads = [threading.Thread(target=worker, args=item, daemon=True) for item in sources.items()]
+    for t in threads:
+        t.start()
+    time.sleep(0.5)
+    start_counts = dict(counts)
+    intervals = _benchmark_render(lambda: frames.get("picam"), seconds)
+    report("threads", intervals, {k: counts[k] - start_counts[k] for k in sources})
+    running = False
+
+    # Capture processes
+    supervisor = CaptureSupervisor()
+    for name, kwargs in sources.items():
+        supervisor.add(name, "capture_supervisor:SyntheticCam", kwargs,
+                       (kwargs["height"], kwargs["width"], 3))
+    supervisor.start()
+    time.sleep(1.0)
+    start_counts = {name: supervisor.count(name) for name in sources}
+    try:
+        intervals = _benchmark_render(lambda: supervisor.latest("picam")[0], seconds)
+        report("processes", intervals,
+               {k: supervisor.count(k) - start_counts[k] for k in sources})
+    finally:
+        supervisor.stop()
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,50 @@
+import cv2
+
+
+class ThermalOverlay:
+    """
+    Blends a thermal frame onto the centre of a PiCam frame, scaled to match
+    the two FOVs. The scaled size and ROI are computed once per frame shape
+    and settings, not on every frame.
+    """
+
+    def __init__(self, settings):
+        self.configure(settings)
+
+    def configure(self, settings):
+        self.scale = settings.fov_thermal / settings.fov_picam
+        self.alpha_picam = settings.overlay_alpha_picam
+        self.alpha_thermal = settings.overlay_alpha_thermal
+        self.align_debug = settings.align_debug
+        self._shapes = None
+
+    def _compute_roi(self, picam_shape, thermal_shape):
+        h, w = picam_shape[:2]
+        # Clamped to the frame and to at least 1 px, whatever the FOV ratio
+        new_w = min(w, max(1, int(thermal_shape[1] * self.scale)))
+        new_h = min(h, max(1, int(thermal_shape[0] * self.scale)))
+        y_start = (h - new_h) // 2
+        x_start = (w - new_w) // 2
+        self.size = (new_w, new_h)
+        self.roi = (slice(y_start, y_start + new_h), slice(x_start, x_start + new_w))
+        self.rect = ((x_start, y_start), (x_start + new_w, y_start + new_h))
+        self._shapes = (picam_shape, thermal_shape)
+
+    def apply(self, frame_picam, frame_thermal):
+        if self._shapes != (frame_picam.shape, frame_thermal.shape):
+            self._compute_roi(frame_picam.shape, frame_thermal.shape)
+
+        thermal_scaled = cv2.resize(frame_thermal, self.size, interpolation=cv2.INTER_LINEAR)
+        frame = frame_picam.copy()
+        frame[self.roi] = cv2.addWeighted(
+            frame_picam[self.roi],
+            self.alpha_picam,
+            thermal_scaled,
+            self.alpha_thermal,
+            0,
+        )
+
+        if self.align_debug:
+            cv2.rectangle(frame, self.rect[0], self.rect[1], (0, 255, 0), 2)
+
+        return frame
@@ -0,0 +1,47 @@
+"""
+Splash frame shown by boot.py. Standard library only: it runs before
+numpy and cv2 are imported.
+"""
+import os
+
+# Precomputed tables are cached here between boots
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "cache")
+FB_DEVICE = "/dev/fb0"
+FB_SYSFS = "/sys/class/graphics/fb0"
+
+
+def splash_file(width, height, k1, k2):
+    """Cache path of the splash for a display geometry; it is rendered through the barrel map."""
+    return os.path.join(CACHE_DIR, f"splash_{width}x{height}_{k1}_{k2}.rgb565")
+
+
+def show_splash(settings):
+    """Blit the cached splash (or a black screen) straight to the framebuffer."""
+    try:
+        with open(os.path.join(FB_SYSFS, "virtual_size")) as f:
+            width, height = (int(v) for v in f.read().strip().split(","))
+        with open(os.path.join(FB_SYSFS, "bits_per_pixel")) as f:
+            bpp = int(f.read().strip())
+    except (OSError, ValueError):
+        width, height, bpp = settings.frame_width, settings.frame_height, 16
+    size = width * height * bpp // 8
+
+    path = splash_file(settings.frame_width, settings.frame_height, settings.barrel_k1, settings.barrel_k2)
+    splash = None
+    try:
+        with open(path, "rb") as f:
+            splash = f.read()
+    except OSError:
+        pass
+    if splash is None or len(splash) != size:
+        splash = bytes(size)
+
+    try:
+        fb = os.open(FB_DEVICE, os.O_WRONLY)
+    except OSError as e:
+        print(f"No framebuffer for splash: {e}")
+        return
+    try:
+        os.write(fb, splash)
+    finally:
+        os.close(fb)
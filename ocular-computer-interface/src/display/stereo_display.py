@@ -1,18 +1,71 @@
 import numpy as np
+import glob
 import os
 import cv2
 
+from display.splash import CACHE_DIR, splash_file
+
+# Barrel maps kept on disk per display size (live k1/k2 tuning creates one per value tried)
+MAX_CACHED_MAPS = 4
+
+
+def _write_cache(path, write):
+    """Write a cache file atomically, so a power cut never leaves half a file behind."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        write(f)
+    os.replace(path + ".tmp", path)
+
+
+def _prune_cache(pattern, keep):
+    """Delete all but the `keep` most recently used files matching pattern."""
+    files = sorted(glob.glob(os.path.join(CACHE_DIR, pattern)), key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 class StereoDisplay:
-    def __init__(self, width=800, height=480, border_px=10):
+    def __init__(self, width=800, height=480, border_px=10, k1=-0.25, k2=0.0):
         self.width = width
         self.height = height
         self.border_px = border_px
+        self.interpolation = cv2.INTER_LINEAR  # lowered by the quality governor
         self.fb0 = os.open("/dev/fb0", os.O_RDWR)
 
-        # Precompute barrel distortion
-        half_w = width // 2
-        half_h = height
-        self.map_x, self.map_y = self._create_barrel_map(half_w, half_h)
+        # Precompute barrel distortion (loaded from disk cache when available)
+        self.k1 = None
+        self.k2 = None
+        self.set_distortion(k1, k2)
+
+    def set_distortion(self, k1, k2):
+        """Rebuild the barrel maps, only if the coefficients actually changed."""
+        if (k1, k2) == (self.k1, self.k2):
+            return
+        half_w = self.width // 2
+        half_h = self.height
+        self.map_x, self.map_y = self._load_barrel_map(half_w, half_h, k1, k2)
+        self.k1, self.k2 = k1, k2
+
+    def _load_barrel_map(self, width, height, k1=-0.25, k2=0.0):
+        path = os.path.join(CACHE_DIR, f"barrel_{width}x{height}_{k1}_{k2}.npz")
+        try:
+            with np.load(path) as cached:
+                maps = cached["map_x"], cached["map_y"]
+            os.utime(path)  # mark as recently used for pruning
+            return maps
+        except (OSError, KeyError, ValueError):
+            pass
+
+        map_x, map_y = self._create_barrel_map(width, height, k1, k2)
+        try:
+            _write_cache(path, lambda f: np.savez(f, map_x=map_x, map_y=map_y))
+            _prune_cache(f"barrel_{width}x{height}_*.npz", MAX_CACHED_MAPS)
+        except OSError as e:
+            print(f"Could not cache barrel map: {e}")
+        return map_x, map_y
 
     def _create_barrel_map(self, width, height, k1=-0.25, k2=0.0):
         x = np.linspace(-1, 1, width)
@@ -31,13 +84,14 @@ class StereoDisplay:
         b = (image[:,:,2] >> 3).astype(np.uint16)
         return ((r << 11) | (g << 5) | b).astype('<u2')
 
-    def show(self, frame):
+    def render(self, frame):
+        """Return the framebuffer bytes for a frame (distortion, border, stereo, RGB565)."""
         half_w = self.width // 2
         half_h = self.height
 
         # Resize and apply distortion
         half_frame = cv2.resize(frame, (half_w, half_h))
-        corrected = cv2.remap(half_frame, self.map_x, self.map_y, interpolation=cv2.INTER_LINEAR)
+        corrected = cv2.remap(half_frame, self.map_x, self.map_y, interpolation=self.interpolation)
 
         # Thin black border
         b = self.border_px
@@ -49,9 +103,27 @@ class StereoDisplay:
         # Stereo duplication
         stereo_frame = np.concatenate((corrected, corrected), axis=1)
 
-        fb_frame = self._rgb888_to_rgb565(stereo_frame)
+        return self._rgb888_to_rgb565(stereo_frame).tobytes()
+
+    def show(self, frame):
         os.lseek(self.fb0, 0, os.SEEK_SET)
-        os.write(self.fb0, fb_frame.tobytes())
+        os.write(self.fb0, self.render(frame))
+
+    def save_splash(self, text="Starting..."):
+        """Render the splash for the current geometry once, so boot.py can show it without numpy/cv2."""
+        path = splash_file(self.width, self.height, self.k1, self.k2)
+        if os.path.exists(path):
+            return
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        (text_w, text_h), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3)
+        org = ((self.width - text_w) // 2, (self.height + text_h) // 2)
+        cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        data = self.render(frame)
+        try:
+            _write_cache(path, lambda f: f.write(data))
+            _prune_cache("splash_*.rgb565", 1)  # only the current geometry is ever shown
+        except OSError as e:
+            print(f"Could not cache splash frame: {e}")
 
     def close(self):
         os.close(self.fb0)
@@ -0,0 +1,113 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# Header layout (uint64 words):
+#   [0] frames written so far
+#   [1] slot of the most recent frame
+#   then per slot: [seq, height, width]
+_HEADER_WORDS = 2
+_SLOT_WORDS = 3
+
+
+class FrameRing:
+    """
+    Fixed-size ring of frames in shared memory, one writer / many readers.
+
+    Every slot carries a sequence counter (seqlock): the writer makes it odd
+    while copying pixels in and even again when done, so a reader can tell
+    whether the slot changed underneath it without taking any lock.
+    """
+
+    def __init__(self, name=None, shape=(480, 800, 3), slots=4, create=False):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.frame_bytes = int(np.prod(self.shape))
+        header_bytes = 8 * (_HEADER_WORDS + _SLOT_WORDS * slots)
+        size = header_bytes + self.frame_bytes * slots
+
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.name = self.shm.name
+        self.owner = create
+
+        self.header = np.ndarray(
+            (_HEADER_WORDS + _SLOT_WORDS * slots,), dtype=np.uint64, buffer=self.shm.buf
+        )
+        self.data = np.ndarray(
+            (slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf, offset=header_bytes
+        )
+        if create:
+            self.header[:] = 0
+
+    def _slot_header(self, slot):
+        base = _HEADER_WORDS + _SLOT_WORDS * slot
+        return self.header[base:base + _SLOT_WORDS]
+
+    @property
+    def count(self):
+        """Number of frames written since the ring was created."""
+        return int(self.header[0])
+
+    def write(self, frame):
+        """Copy a frame into the next slot. Frames smaller than the slot are allowed."""
+        h, w = frame.shape[:2]
+        if h > self.shape[0] or w > self.shape[1]:
+            raise ValueError(f"Frame {frame.shape} does not fit ring slot {self.shape}")
+
+        slot = self.count % self.slots
+        hdr = self._slot_header(slot)
+        # odd: write in progress. A writer killed mid-write leaves the slot odd;
+        # step to the next odd value so the parity is right again
+        hdr[0] += 2 if int(hdr[0]) & 1 else 1
+        self.data[slot, :h, :w] = frame
+        hdr[1] = h
+        hdr[2] = w
+        hdr[0] += 1  # even: slot is consistent again
+        self.header[1] = slot
+        self.header[0] += 1
+
+    def latest_view(self):
+        """
+        Return (view, slot, seq, count) for the newest frame without copying,
+        or None if nothing has been written yet. The view is only valid while
+        still_valid(slot, seq) is True.
+        """
+        for _ in range(self.slots):
+            count = self.count
+            if count == 0:
+                return None
+            slot = int(self.header[1])
+            hdr = self._slot_header(slot)
+            seq = int(hdr[0])
+            if seq & 1:
+                continue
+            h, w = int(hdr[1]), int(hdr[2])
+            view = self.data[slot, :h, :w]
+            if int(hdr[0]) == seq:
+                return view, slot, seq, count
+        return None
+
+    def still_valid(self, slot, seq):
+        return int(self._slot_header(slot)[0]) == seq
+
+    def read(self):
+        """Return (frame copy, count) for the newest frame, or (None, 0)."""
+        for _ in range(self.slots):
+            latest = self.latest_view()
+            if latest is None:
+                return None, 0
+            view, slot, seq, count = latest
+            frame = view.copy()
+            if self.still_valid(slot, seq):
+                return frame, count
+        return None, 0
+
+    def close(self):
+        # Drop numpy views before closing, otherwise the buffer stays exported
+        self.header = None
+        self.data = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,235 @@
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+THERMAL_ZONE = "/sys/class/thermal/thermal_zone0/temp"
+CPU_FREQ = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"
+# Same flags as `vcgencmd get_throttled` (hex), exposed by the Raspberry Pi firmware driver
+FIRMWARE_THROTTLED = "/sys/devices/platform/soc/soc:firmware/get_throttled"
+
+# vcgencmd get_throttled bits that are "active now" (not the sticky history bits)
+THROTTLE_UNDERVOLTAGE = 0x1
+THROTTLE_FREQ_CAPPED = 0x2
+THROTTLE_THROTTLED = 0x4
+THROTTLE_SOFT_TEMP_LIMIT = 0x8
+THROTTLE_ACTIVE = 0xF
+
+# Render quality steps, from full quality down. Each step keeps the previous
+# reductions and adds the next-cheapest one. The last step lowers the capture
+# resolution, which reopens the cameras (a multi-second outage), so it is
+# only used when enabled and then held for at least CAPTURE_LEVEL_MIN_TIME.
+QUALITY_LEVELS = [
+    {"interpolation": "linear", "thermal_smoothing": True, "thermal_interval_factor": 1, "capture_scale": 1.0},
+    {"interpolation": "linear", "thermal_smoothing": True, "thermal_interval_factor": 2, "capture_scale": 1.0},
+    {"interpolation": "linear", "thermal_smoothing": False, "thermal_interval_factor": 2, "capture_scale": 1.0},
+    {"interpolation": "nearest", "thermal_smoothing": False, "thermal_interval_factor": 4, "capture_scale": 1.0},
+    {"interpolation": "nearest", "thermal_smoothing": False, "thermal_interval_factor": 4, "capture_scale": 0.5},
+]
+CAPTURE_LEVEL = len(QUALITY_LEVELS) - 1
+CAPTURE_LEVEL_MIN_TIME = 120.0  # seconds
+
+
+class PiSensor:
+    """
+    CPU temperature, frequency and throttle flags of the Raspberry Pi.
+    read() may block (vcgencmd is a subprocess); use it through BackgroundSensor
+    from the render loop.
+    """
+
+    def __init__(self):
+        self.sysfs_throttled = os.path.exists(FIRMWARE_THROTTLED)
+        self.vcgencmd = None if self.sysfs_throttled else shutil.which("vcgencmd")
+
+    def _read(self, path):
+        try:
+            with open(path) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def read(self):
+        """Return (temp in °C or None, throttle flags, CPU MHz or None)."""
+        temp = self._read(THERMAL_ZONE)
+        freq = self._read(CPU_FREQ)
+        throttled = 0
+        if self.sysfs_throttled:
+            try:
+                with open(FIRMWARE_THROTTLED) as f:
+                    throttled = int(f.read().strip(), 16)
+            except (OSError, ValueError):
+                pass
+        elif self.vcgencmd:
+            try:
+                out = subprocess.run([self.vcgencmd, "get_throttled"], capture_output=True,
+                                     text=True, timeout=1.0).stdout
+                match = re.search(r"throttled=(0x[0-9a-fA-F]+)", out)
+                if match:
+                    throttled = int(match.group(1), 16)
+            except (OSError, subprocess.SubprocessError):
+                pass
+        return (
+            temp / 1000.0 if temp is not None else None,
+            throttled,
+            freq / 1000.0 if freq is not None else None,
+        )
+
+
+class BackgroundSensor:
+    """
+    Samples a sensor on a daemon thread every `interval` seconds. read()
+    returns the latest sample without blocking, so the render loop never
+    waits on sysfs or vcgencmd.
+    """
+
+    def __init__(self, sensor, interval=2.0):
+        self.sensor = sensor
+        self.interval = interval
+        self.reading = (None, 0, None)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.reading = self.sensor.read()
+            self._stop.wait(self.interval)
+
+    def read(self):
+        return self.reading
+
+    def stop(self):
+        self._stop.set()
+
+
+class FakeSensor:
+    """Scripted readings for running the governor off the Pi. Repeats the last reading."""
+
+    def __init__(self, readings):
+        self.readings = list(readings)
+        self.index = 0
+
+    def read(self):
+        reading = self.readings[min(self.index, len(self.readings) - 1)]
+        self.index += 1
+        return reading
+
+
+class QualityGovernor:
+    """
+    Steps render quality down when the Pi is hot, throttling or missing the
+    target frame rate, and back up once there is headroom again.
+
+    update() is called once per rendered frame with that frame's duration;
+    the sensor is only sampled every `interval` seconds, and a step is only
+    taken after the condition held for `hold` seconds, so the quality does
+    not oscillate.
+    """
+
+    def __init__(self, sensor=None, target_fps=25.0, temp_high=75.0, temp_low=65.0,
+                 interval=2.0, hold=4.0, allow_capture_scale=False, clock=time.time):
+        self.sensor = sensor or BackgroundSensor(PiSensor(), interval)
+        self.target_fps = target_fps
+        self.temp_high = temp_high
+        self.temp_low = temp_low
+        self.interval = interval
+        self.hold = hold
+        self.allow_capture_scale = allow_capture_scale
+        self.clock = clock
+
+        self.level = 0
+        self.frame_time = None
+        self.temp = None
+        self.throttled = 0
+        self.freq = None
+        self._last_sample = None
+        self._pressure_since = None
+        self._headroom_since = None
+        self._level_since = None
+
+    @property
+    def max_level(self):
+        return CAPTURE_LEVEL if self.allow_capture_scale else CAPTURE_LEVEL - 1
+
+    @property
+    def quality(self):
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def fps(self):
+        return 1.0 / self.frame_time if self.frame_time else 0.0
+
+    def configure(self, settings):
+        self.target_fps = settings.governor_target_fps
+        self.temp_high = settings.governor_temp_high
+        self.temp_low = settings.governor_temp_low
+        self.allow_capture_scale = settings.governor_capture_scale
+        if self.level > self.max_level:
+            self._set_level(self.max_level, self.clock())
+
+    def update(self, frame_time):
+        """Feed one frame time; return True if the quality level changed."""
+        # Exponential moving average, smooths out single slow frames
+        if self.frame_time is None:
+            self.frame_time = frame_time
+        else:
+            self.frame_time += 0.1 * (frame_time - self.frame_time)
+
+        now = self.clock()
+        if self._last_sample is not None and now - self._last_sample < self.interval:
+            return False
+        self._last_sample = now
+        self.temp, self.throttled, self.freq = self.sensor.read()
+
+        hot = self.temp is not None and self.temp >= self.temp_high
+        cool = self.temp is None or self.temp <= self.temp_low
+        throttling = bool(self.throttled & THROTTLE_ACTIVE)
+        slow = self.fps < 0.9 * self.target_fps
+        fast = self.fps > 1.1 * self.target_fps
+
+        if hot or throttling or slow:
+            self._headroom_since = None
+            if self._pressure_since is None:
+                self._pressure_since = now
+            if now - self._pressure_since >= self.hold and self.level < self.max_level:
+                self._set_level(self.level + 1, now)
+                self._pressure_since = now
+                self._report("down", hot, throttling, slow)
+                return True
+        elif cool and fast:
+            self._pressure_since = None
+            if self._headroom_since is None:
+                self._headroom_since = now
+            # Recovering is deliberately slower than backing off, and leaving the
+            # capture step reopens the cameras, so it is held much longer
+            min_time = CAPTURE_LEVEL_MIN_TIME if self.level == CAPTURE_LEVEL else 0.0
+            if (now - self._headroom_since >= 2 * self.hold and self.level > 0
+                    and now - self._level_since >= min_time):
+                self._set_level(self.level - 1, now)
+                self._headroom_since = now
+                self._report("up", hot, throttling, slow)
+                return True
+        else:
+            self._pressure_since = None
+            self._headroom_since = None
+        return False
+
+    def _set_level(self, level, now):
+        self.level = level
+        self._level_since = now
+
+    def _report(self, direction, hot, throttling, slow):
+        reasons = [name for name, active in (("hot", hot), ("throttled", throttling), ("slow", slow)) if active]
+        temp = f"{self.temp:.1f}C" if self.temp is not None else "n/a"
+        print(f"Quality {direction} to level {self.level} "
+              f"({', '.join(reasons) or 'headroom'}; {temp}, {self.fps:.1f} fps)")
+
+    def status(self):
+        return {
+            "quality_level": self.level,
+            "cpu_temp": self.temp,
+            "cpu_mhz": self.freq,
+            "throttled": hex(self.throttled),
+        }
@@ -1,109 +1,122 @@
+import os
+import sys
 import time
 from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 
-from cameras.picam import PiCam
-from cameras.thermal import ThermalCam
+from boot import StartupProfiler
+from settings import load_settings_or_defaults, affected, SettingsWatcher
+from governor import QualityGovernor, QUALITY_LEVELS
+from display.overlay import ThermalOverlay
 from display.stereo_display import StereoDisplay
 
 from controls.switch import get_position
 from controls.rotary import get_rotation, is_pressed
 
 # --- SETTINGS ---
-FRAME_WIDTH = 800
-FRAME_HEIGHT = 480
-BORDER_PX = 10
+# Loaded once from config/settings.json and hot-reloaded by the render loop;
+# a bad file at boot falls back to the defaults rather than stopping the headset
+settings = load_settings_or_defaults()
 
-ZOOM_STEP = 0.1   # per encoder tick
-ENCODER_MESSAGE_TIME = 1.0  # seconds
 
-# FOV (approximate, horizontal)
-FOV_PICAM = 75
-FOV_THERMAL = 55
-
-# Overlay blend weights
-OVERLAY_ALPHA_PICAM = 0.7
-OVERLAY_ALPHA_THERMAL = 0.3
-
-# Thermal smoothing
-THERMAL_SMOOTHING = True
-SMOOTHING_KERNEL = (5, 5)
-SMOOTHING_SIGMA = 1.5
-
-# Overlay performance
-THERMAL_UPDATE_INTERVAL = 10  # update thermal once every N PiCam frames
-
-# Debug overlay alignment
-ALIGN_DEBUG = False
-
-# Map switch positions to camera modes
-SWITCH_CAMERA_MAP = {
-    1: "picam",
-    2: "picam_noir",
-    3: "thermal",
-    4: "overlay_picam",       # PiCam + Thermal overlay
-    5: "overlay_picam_noir"   # PiCam NoIR + Thermal overlay
-}
-
-
-def smooth_thermal(frame):
-    if THERMAL_SMOOTHING:
-        return cv2.GaussianBlur(frame, SMOOTHING_KERNEL, SMOOTHING_SIGMA)
+def smooth_thermal(frame, quality):
+    if settings.thermal_smoothing and quality["thermal_smoothing"]:
+        return cv2.GaussianBlur(frame, settings.smoothing_kernel, settings.smoothing_sigma)
     return frame
 
 
-def overlay_thermal_on_picam(frame_picam, frame_thermal):
-    """Resize + align thermal to match PiCam FOV before overlay."""
-    h, w, _ = frame_picam.shape
-
-    # Scale factor (thermal FOV is smaller → shrink thermal image)
-    scale = FOV_THERMAL / FOV_PICAM
-    new_w = int(frame_thermal.shape[1] * scale)
-    new_h = int(frame_thermal.shape[0] * scale)
-    thermal_scaled = cv2.resize(frame_thermal, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+def thermal_cams(cam):
+    """ThermalCam instances in the current camera setup."""
+    if isinstance(cam, dict):
+        return [cam["thermal"]]
+    return [cam] if hasattr(cam, "set_colormap") else []
 
-    # Place thermal at center of PiCam frame
-    y_start = (h - new_h) // 2
-    x_start = (w - new_w) // 2
-    thermal_overlay = frame_picam.copy()
-    thermal_overlay[y_start:y_start+new_h, x_start:x_start+new_w] = cv2.addWeighted(
-        frame_picam[y_start:y_start+new_h, x_start:x_start+new_w],
-        OVERLAY_ALPHA_PICAM,
-        thermal_scaled,
-        OVERLAY_ALPHA_THERMAL,
-        0,
-    )
 
-    if ALIGN_DEBUG:
-        cv2.rectangle(thermal_overlay, (x_start, y_start), (x_start+new_w, y_start+new_h), (0,255,0), 2)
+def apply_settings(changed, display, overlay, cam, governor):
+    """Rebuild only the precomputed state that depends on the changed settings."""
+    rebuild = affected(changed)
+    if "display" in rebuild:
+        display.border_px = settings.border_px
+        display.set_distortion(settings.barrel_k1, settings.barrel_k2)
+        display.save_splash()
+    if "overlay" in rebuild:
+        overlay.configure(settings)
+    if "colormap" in rebuild:
+        for c in thermal_cams(cam):
+            c.set_colormap(settings.thermal_colormap, settings.thermal_invert)
+    if "governor" in rebuild and governor:
+        governor.configure(settings)
 
-    return thermal_overlay
 
+def create_camera(mode, capture_scale=1.0):
+    width = int(settings.frame_width * capture_scale)
+    height = int(settings.frame_height * capture_scale)
+    colormap = {"colormap": settings.thermal_colormap, "invert": settings.thermal_invert}
 
-def create_camera(mode):
+    # Backends are imported on first use, so e.g. a PiCam-only boot never loads the I2C stack
     if mode == "thermal":
-        return ThermalCam(width=FRAME_WIDTH//2, height=FRAME_HEIGHT)
+        from cameras.thermal import ThermalCam
+        return ThermalCam(width=width//2, height=height, **colormap)
 
     elif mode in ("overlay_picam", "overlay_picam_noir"):
+        from cameras.picam import PiCam
+        from cameras.thermal import ThermalCam
         camera_num = 0 if mode == "overlay_picam_noir" else 1
-        return {
-            "picam": PiCam(camera_num=camera_num, width=FRAME_WIDTH, height=FRAME_HEIGHT),
-            "thermal": ThermalCam(width=FRAME_WIDTH, height=FRAME_HEIGHT)
-        }
+        # Open both sensors concurrently; each spends most of its time waiting on hardware
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = {
+                "picam": pool.submit(PiCam, camera_num=camera_num, width=width, height=height,
+                                     warmup=settings.picam_warmup),
+                "thermal": pool.submit(ThermalCam, width=width, height=height, **colormap),
+            }
+        # Both have finished here; if one failed, close the other so it does not keep the device busy
+        error = next((f.exception() for f in futures.values() if f.exception()), None)
+        if error:
+            for f in futures.values():
+                if not f.exception() and hasattr(f.result(), "stop"):
+                    f.result().stop()
+            raise error
+        return {name: f.result() for name, f in futures.items()}
 
     else:  # picam / picam_noir
+        from cameras.picam import PiCam
         camera_num = 0 if mode == "picam_noir" else 1
         for attempt in range(3):
             try:
-                return PiCam(camera_num=camera_num, width=FRAME_WIDTH, height=FRAME_HEIGHT)
+                return PiCam(camera_num=camera_num, width=width, height=height,
+                             warmup=settings.picam_warmup)
             except RuntimeError:
                 print(f"Failed to open camera, retrying... ({attempt+1}/3)")
                 time.sleep(0.1)
         raise RuntimeError(f"Unable to open camera {mode}")
 
 
-def main():
-    display = StereoDisplay(width=FRAME_WIDTH, height=FRAME_HEIGHT, border_px=BORDER_PX)
+def create_preview_server():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from web.server import PreviewServer
+
+    server = PreviewServer(width=settings.frame_width, height=settings.frame_height, port=settings.web_port)
+    server.start()
+    print(f"Web preview on port {settings.web_port}")
+    return server
+
+
+def main(profiler=None):
+    profiler = profiler or StartupProfiler()
+    with profiler.phase("display init"):
+        display = StereoDisplay(width=settings.frame_width, height=settings.frame_height,
+                                border_px=settings.border_px, k1=settings.barrel_k1, k2=settings.barrel_k2)
+        display.save_splash()
+    preview = create_preview_server() if settings.web_preview else None
+    overlay = ThermalOverlay(settings)
+    watcher = SettingsWatcher(settings)
+    governor = None
+    if settings.governor_enabled:
+        governor = QualityGovernor()
+        governor.configure(settings)
+    quality = QUALITY_LEVELS[0]
+    reopen = False
 
     current_mode = None
     cam = None
@@ -112,14 +125,22 @@ def main():
     zoom_factor = 1.0
     frame_counter = 0
     last_thermal_frame = None
+    fps = 0.0
+    fps_frames = 0
+    fps_timer = time.time()
 
     try:
         while True:
+            # --- Settings hot reload (cameras keep running) ---
+            changed = watcher.poll()
+            if changed:
+                apply_settings(changed, display, overlay, cam, governor)
+
             # --- Switch handling ---
             switch_pos = get_position()
-            if switch_pos in SWITCH_CAMERA_MAP:
-                selected_mode = SWITCH_CAMERA_MAP[switch_pos]
-                if selected_mode != current_mode:
+            if switch_pos in settings.switch_camera_map:
+                selected_mode = settings.switch_camera_map[switch_pos]
+                if selected_mode != current_mode or reopen:
                     print(f"Switching camera to: {selected_mode}")
                     if cam:
                         if isinstance(cam, dict):
@@ -128,11 +149,13 @@ def main():
                         elif hasattr(cam, "stop"):
                             cam.stop()
                         cam = None
-                    cam = create_camera(selected_mode)
+                    with profiler.phase(f"open {selected_mode}"):
+                        cam = create_camera(selected_mode, quality["capture_scale"])
                     current_mode = selected_mode
+                    reopen = False
 
                     # Restore zoom
-                    if isinstance(cam, PiCam):
+                    if hasattr(cam, "set_zoom"):
                         cam.set_zoom(zoom_factor)
                     elif isinstance(cam, dict) and "picam" in cam:
                         cam["picam"].set_zoom(zoom_factor)
@@ -142,20 +165,27 @@ def main():
                 continue
 
             # --- Capture ---
-            if isinstance(cam, PiCam):
+            # Frame time for the governor excludes waiting on the base camera,
+            # which no quality setting can speed up
+            if current_mode == "thermal":
                 frame = cam.capture()
+                frame_start = time.time()
+                frame = smooth_thermal(frame, quality)
 
-            elif isinstance(cam, ThermalCam):
-                frame = smooth_thermal(cam.capture())
+            elif hasattr(cam, "set_zoom"):  # PiCam
+                frame = cam.capture()
+                frame_start = time.time()
 
             elif isinstance(cam, dict):
                 frame_picam = cam["picam"].capture()
+                frame_start = time.time()
 
                 # update thermal frame only every N iterations
-                if frame_counter % THERMAL_UPDATE_INTERVAL == 0 or last_thermal_frame is None:
-                    last_thermal_frame = smooth_thermal(cam["thermal"].capture())
+                thermal_interval = settings.thermal_update_interval * quality["thermal_interval_factor"]
+                if frame_counter % thermal_interval == 0 or last_thermal_frame is None:
+                    last_thermal_frame = smooth_thermal(cam["thermal"].capture(), quality)
 
-                frame = overlay_thermal_on_picam(frame_picam, last_thermal_frame)
+                frame = overlay.apply(frame_picam, last_thermal_frame)
 
             else:
                 frame = None
@@ -168,23 +198,23 @@ def main():
             button_pressed = is_pressed()
 
             if rotation != 0:
-                zoom_factor = max(1.0, zoom_factor + ZOOM_STEP * rotation)
-                if isinstance(cam, PiCam):
+                zoom_factor = max(1.0, zoom_factor + settings.zoom_step * rotation)
+                if hasattr(cam, "set_zoom"):
                     cam.set_zoom(zoom_factor)
                 elif isinstance(cam, dict) and "picam" in cam:
                     cam["picam"].set_zoom(zoom_factor)
 
                 encoder_message = f"Zoom: {zoom_factor:.1f}x"
-                encoder_timer = ENCODER_MESSAGE_TIME
+                encoder_timer = settings.encoder_message_time
 
             elif button_pressed:
                 zoom_factor = 1.0
-                if isinstance(cam, PiCam):
+                if hasattr(cam, "set_zoom"):
                     cam.set_zoom(1.0)
                 elif isinstance(cam, dict) and "picam" in cam:
                     cam["picam"].set_zoom(1.0)
                 encoder_message = "Zoom reset"
-                encoder_timer = ENCODER_MESSAGE_TIME
+                encoder_timer = settings.encoder_message_time
 
             # --- Overlay status text ---
             text_lines = []
@@ -193,21 +223,57 @@ def main():
             if encoder_timer > 0:
                 text_lines.append(encoder_message)
 
-            y0 = FRAME_HEIGHT // 2 - (len(text_lines) * 20)
+            # Text keeps its on-screen size when the governor lowers the capture resolution
+            text_scale = quality["capture_scale"]
+            thickness = max(1, int(2 * text_scale))
+            y0 = frame.shape[0] // 2 - int(len(text_lines) * 20 * text_scale)
             for i, line in enumerate(text_lines):
-                (text_w, text_h), _ = cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)
-                x = (FRAME_WIDTH - text_w) // 2
-                y = y0 + i * (text_h + 10)
-                cv2.putText(frame, line, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+                (text_w, text_h), _ = cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, text_scale, thickness)
+                x = (frame.shape[1] - text_w) // 2
+                y = y0 + i * (text_h + int(10 * text_scale))
+                cv2.putText(frame, line, (x, y), cv2.FONT_HERSHEY_SIMPLEX, text_scale, (255, 255, 255), thickness)
 
             if encoder_timer > 0:
                 encoder_timer -= 0.01
             else:
                 encoder_message = ""
 
+            # --- Web preview ---
+            if preview:
+                preview.publish(frame)
+                fps_frames += 1
+                elapsed = time.time() - fps_timer
+                if elapsed >= settings.web_status_interval:
+                    fps = fps_frames / elapsed
+                    fps_frames = 0
+                    fps_timer = time.time()
+                    preview.set_status(
+                        mode=current_mode,
+                        switch=switch_pos,
+                        zoom=round(zoom_factor, 1),
+                        render_fps=round(fps, 1),
+                        frames=frame_counter,
+                        **(governor.status() if governor else {}),
+                    )
+
             # --- Show ---
             display.show(frame)
+            if frame_counter == 0:
+                profiler.mark("first frame")
             frame_counter += 1
+
+            # --- Quality governor ---
+            # The level changes in update() or when a settings reload reconfigures it
+            if governor:
+                governor.update(time.time() - frame_start)
+            if governor and governor.quality is not quality:
+                previous = quality
+                quality = governor.quality
+                display.interpolation = (
+                    cv2.INTER_NEAREST if quality["interpolation"] == "nearest" else cv2.INTER_LINEAR
+                )
+                # Changing the capture resolution means reopening the cameras
+                reopen = quality["capture_scale"] != previous["capture_scale"]
             sleep(0.01)
 
     except KeyboardInterrupt:
@@ -219,8 +285,10 @@ def main():
                     if hasattr(c, "stop"): c.stop()
             elif hasattr(cam, "stop"):
                 cam.stop()
+        if preview:
+            preview.stop()
         display.close()
 
 
 if __name__ == "__main__":
-    main()
+    main(profiler=StartupProfiler(enabled="--profile-startup" in sys.argv))
@@ -0,0 +1,171 @@
+import cv2
+from time import sleep
+
+from capture_supervisor import CaptureSupervisor
+from settings import load_settings_or_defaults
+from display.overlay import ThermalOverlay
+from display.stereo_display import StereoDisplay
+from controls.switch import get_position
+from controls.rotary import get_rotation, is_pressed
+
+# --- SETTINGS ---
+SETTINGS = load_settings_or_defaults()
+FRAME_WIDTH = SETTINGS.frame_width
+FRAME_HEIGHT = SETTINGS.frame_height
+
+# Map switch positions to camera modes
+SWITCH_CAMERA_MAP = SETTINGS.switch_camera_map
+
+# Re-reads of a frame a capture process overwrote while we composed it
+READ_ATTEMPTS = 3
+
+# Base camera of every mode
+MODE_SOURCES = {
+    "picam": "picam",
+    "picam_noir": "picam_noir",
+    "thermal": "thermal",
+    "overlay_picam": "picam",
+    "overlay_picam_noir": "picam_noir",
+}
+
+
+def create_supervisor():
+    """Each camera runs in its own process; they are only referenced by module path here."""
+    supervisor = CaptureSupervisor()
+    supervisor.add(
+        "picam", "cameras.picam:PiCam",
+        {"camera_num": 1, "width": FRAME_WIDTH, "height": FRAME_HEIGHT},
+        (FRAME_HEIGHT, FRAME_WIDTH, 3),
+    )
+    supervisor.add(
+        "picam_noir", "cameras.picam:PiCam",
+        {"camera_num": 0, "width": FRAME_WIDTH, "height": FRAME_HEIGHT},
+        (FRAME_HEIGHT, FRAME_WIDTH, 3),
+    )
+    supervisor.add(
+        "thermal", "cameras.thermal:ThermalCam",
+        {"width": FRAME_WIDTH, "height": FRAME_HEIGHT,
+         "colormap": SETTINGS.thermal_colormap, "invert": SETTINGS.thermal_invert},
+        (FRAME_HEIGHT, FRAME_WIDTH, 3),
+    )
+    return supervisor
+
+
+def smooth_thermal(frame):
+    if SETTINGS.thermal_smoothing:
+        return cv2.GaussianBlur(frame, SETTINGS.smoothing_kernel, SETTINGS.smoothing_sigma)
+    return frame
+
+
+def compose_frame(supervisor, overlay, mode):
+    """
+    Build the frame for `mode` from the capture rings. The result never
+    aliases shared memory; check the returned leases with still_valid()
+    before using it.
+    """
+    base, base_lease = supervisor.latest(MODE_SOURCES[mode])
+    if base is None:
+        return None, ()
+
+    if mode == "thermal":
+        # Thermal-only mode shows the half-width frame, as in main.py
+        half = cv2.resize(base, (FRAME_WIDTH // 2, FRAME_HEIGHT), interpolation=cv2.INTER_NEAREST)
+        return smooth_thermal(half), (base_lease,)
+
+    if mode.startswith("overlay"):
+        thermal, thermal_lease = supervisor.latest("thermal")
+        if thermal is not None:
+            return overlay.apply(base, smooth_thermal(thermal)), (base_lease, thermal_lease)
+
+    return base.copy(), (base_lease,)
+
+
+def main():
+    display = StereoDisplay(width=FRAME_WIDTH, height=FRAME_HEIGHT, border_px=SETTINGS.border_px,
+                            k1=SETTINGS.barrel_k1, k2=SETTINGS.barrel_k2)
+    overlay = ThermalOverlay(SETTINGS)
+    supervisor = create_supervisor()
+    supervisor.start()
+
+    current_mode = None
+    zoom_factor = 1.0
+    encoder_message = ""
+    encoder_timer = 0
+    torn_frames = 0
+
+    try:
+        while True:
+            # --- Check switch ---
+            switch_pos = get_position()
+            if switch_pos in SWITCH_CAMERA_MAP:
+                current_mode = SWITCH_CAMERA_MAP[switch_pos]
+
+            if current_mode is None:
+                sleep(0.05)
+                continue
+
+            # --- Get frame (read from zero-copy views into the capture rings) ---
+            for _ in range(READ_ATTEMPTS):
+                frame, leases = compose_frame(supervisor, overlay, current_mode)
+                if frame is None or supervisor.still_valid(*leases):
+                    break
+                # A capture process lapped the ring while we read from it
+                torn_frames += 1
+                frame = None
+
+            if frame is None:
+                # Nothing new and consistent yet; the display keeps the last good frame
+                sleep(0.01)
+                continue
+
+            # --- Encoder ---
+            rotation = get_rotation()
+            button_pressed = is_pressed()
+
+            if rotation != 0:
+                zoom_factor = max(1.0, zoom_factor + SETTINGS.zoom_step * rotation)
+                encoder_message = f"Zoom: {zoom_factor:.1f}x"
+                encoder_timer = SETTINGS.encoder_message_time
+            elif button_pressed:
+                zoom_factor = 1.0
+                encoder_message = "Zoom reset"
+                encoder_timer = SETTINGS.encoder_message_time
+
+            if rotation != 0 or button_pressed:
+                supervisor.set_zoom("picam", zoom_factor)
+                supervisor.set_zoom("picam_noir", zoom_factor)
+
+            # --- Overlay text ---
+            text_lines = []
+            if switch_pos:
+                text_lines.append(f"Switch: {switch_pos}")
+            if encoder_timer > 0:
+                text_lines.append(encoder_message)
+
+            y0 = FRAME_HEIGHT // 2 - (len(text_lines) * 20)
+            for i, line in enumerate(text_lines):
+                (text_w, text_h), _ = cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)
+                x = (FRAME_WIDTH - text_w) // 2
+                y = y0 + i * (text_h + 10)
+                cv2.putText(frame, line, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+
+            if encoder_timer > 0:
+                encoder_timer -= 0.01
+            else:
+                encoder_message = ""
+
+            # Show frame
+            display.show(frame)
+            sleep(0.01)
+
+    except KeyboardInterrupt:
+        print("Exiting...")
+    finally:
+        supervisor.stop()
+        display.close()
+        if torn_frames:
+            print(f"Torn frames: {torn_frames}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,16 @@ from cameras.thermal import ThermalCam
 from display.stereo_display import StereoDisplay
 from controls.switch import get_position
 from controls.rotary import get_rotation, is_pressed
+from settings import load_settings_or_defaults
 
 # --- SETTINGS ---
-FRAME_WIDTH = 800
-FRAME_HEIGHT = 480
-BORDER_PX = 10
+SETTINGS = load_settings_or_defaults()
+FRAME_WIDTH = SETTINGS.frame_width
+FRAME_HEIGHT = SETTINGS.frame_height
+BORDER_PX = SETTINGS.border_px
 
 # Map switch positions to camera modes
-SWITCH_CAMERA_MAP = {
-    1: "picam",
-    2: "picam_noir",
-    3: "thermal",
-    4: "overlay_picam",
-    5: "overlay_picam_noir"
-}
+SWITCH_CAMERA_MAP = SETTINGS.switch_camera_map
 
 # --- Shared frame buffers ---
 frames = {
@@ -43,7 +39,8 @@ def capture_worker(name, cam_class, kwargs):
 
 # --- Main ---
 def main():
-    display = StereoDisplay(width=FRAME_WIDTH, height=FRAME_HEIGHT, border_px=BORDER_PX)
+    display = StereoDisplay(width=FRAME_WIDTH, height=FRAME_HEIGHT, border_px=BORDER_PX,
+                            k1=SETTINGS.barrel_k1, k2=SETTINGS.barrel_k2)
 
     # Start all capture threads
     threading.Thread(
@@ -60,7 +57,8 @@ def main():
 
     threading.Thread(
         target=capture_worker,
-        args=("thermal", ThermalCam, {"width": FRAME_WIDTH // 2, "height": FRAME_HEIGHT}),
+        args=("thermal", ThermalCam, {"width": FRAME_WIDTH // 2, "height": FRAME_HEIGHT,
+                                      "colormap": SETTINGS.thermal_colormap, "invert": SETTINGS.thermal_invert}),
         daemon=True,
     ).start()
 
@@ -86,8 +84,8 @@ def main():
                 base = frames.get("picam")
                 overlay = frames.get("thermal")
                 if base is not None and overlay is not None:
-                    # Resize overlay to match FOV ratio (55 vs 75 deg)
-                    scale = 75.0 / 55.0
+                    # Resize overlay to match FOV ratio
+                    scale = SETTINGS.fov_picam / SETTINGS.fov_thermal
                     h, w = overlay.shape[:2]
                     overlay_resized = cv2.resize(
                         overlay,
@@ -99,13 +97,13 @@ def main():
                     y0 = (oh - base.shape[0]) // 2
                     x0 = (ow - base.shape[1]) // 2
                     overlay_cropped = overlay_resized[y0:y0+base.shape[0], x0:x0+base.shape[1]]
-                    frame = cv2.addWeighted(base, 0.7, overlay_cropped, 0.3, 0)
+                    frame = cv2.addWeighted(base, SETTINGS.overlay_alpha_picam, overlay_cropped, SETTINGS.overlay_alpha_thermal, 0)
 
             elif current_mode == "overlay_picam_noir":
                 base = frames.get("picam_noir")
                 overlay = frames.get("thermal")
                 if base is not None and overlay is not None:
-                    scale = 75.0 / 55.0
+                    scale = SETTINGS.fov_picam / SETTINGS.fov_thermal
                     h, w = overlay.shape[:2]
                     overlay_resized = cv2.resize(
                         overlay,
@@ -116,7 +114,7 @@ def main():
                     y0 = (oh - base.shape[0]) // 2
                     x0 = (ow - base.shape[1]) // 2
                     overlay_cropped = overlay_resized[y0:y0+base.shape[0], x0:x0+base.shape[1]]
-                    frame = cv2.addWeighted(base, 0.7, overlay_cropped, 0.3, 0)
+                    frame = cv2.addWeighted(base, SETTINGS.overlay_alpha_picam, overlay_cropped, SETTINGS.overlay_alpha_thermal, 0)
 
             # Skip if no frame available yet
             if frame is None:
@@ -128,14 +126,13 @@ def main():
             button_pressed = is_pressed()
 
             if rotation != 0:
-                step = 0.1
-                zoom_factor = max(1.0, zoom_factor + step * rotation)
+                zoom_factor = max(1.0, zoom_factor + SETTINGS.zoom_step * rotation)
                 encoder_message = f"Zoom: {zoom_factor:.1f}x"
-                encoder_timer = 1.0
+                encoder_timer = SETTINGS.encoder_message_time
             elif button_pressed:
                 zoom_factor = 1.0
                 encoder_message = "Zoom reset"
-                encoder_timer = 1.0
+                encoder_timer = SETTINGS.encoder_message_time
 
             # --- Overlay text ---
             text_lines = []
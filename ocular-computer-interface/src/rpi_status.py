@@ -9,26 +9,22 @@ from display.stereo_display import StereoDisplay
 
 from controls.switch import get_position
 from controls.rotary import get_rotation, is_pressed
+from settings import load_settings_or_defaults
 
 # --- SETTINGS ---
-FRAME_WIDTH = 800
-FRAME_HEIGHT = 480
-BORDER_PX = 10
-ZOOM_STEP = 0.1
+SETTINGS = load_settings_or_defaults()
+FRAME_WIDTH = SETTINGS.frame_width
+FRAME_HEIGHT = SETTINGS.frame_height
+BORDER_PX = SETTINGS.border_px
+ZOOM_STEP = SETTINGS.zoom_step
 
 # Camera FOVs
-PICAM_FOV = 75  # degrees
-THERMAL_FOV = 55  # degrees
+PICAM_FOV = SETTINGS.fov_picam  # degrees
+THERMAL_FOV = SETTINGS.fov_thermal  # degrees
 FOV_SCALE = THERMAL_FOV / PICAM_FOV  # scaling factor for overlay
 
 # Map switch positions to camera modes
-SWITCH_CAMERA_MAP = {
-    1: "picam",
-    2: "picam_noir",
-    3: "thermal",
-    4: "overlay_picam",
-    5: "overlay_noir",
-}
+SWITCH_CAMERA_MAP = SETTINGS.switch_camera_map
 
 # --- Global storage for thermal frames ---
 thermal_frame = None
@@ -38,7 +34,8 @@ thermal_lock = threading.Lock()
 def thermal_thread_worker():
     """Background thermal capture thread."""
     global thermal_frame
-    cam = ThermalCam(width=FRAME_WIDTH // 2, height=FRAME_HEIGHT)
+    cam = ThermalCam(width=FRAME_WIDTH // 2, height=FRAME_HEIGHT,
+                     colormap=SETTINGS.thermal_colormap, invert=SETTINGS.thermal_invert)
 
     while True:
         frame = cam.capture()
@@ -91,7 +88,8 @@ def overlay_thermal(base_frame, thermal_frame):
 
 
 def main():
-    display = StereoDisplay(width=FRAME_WIDTH, height=FRAME_HEIGHT, border_px=BORDER_PX)
+    display = StereoDisplay(width=FRAME_WIDTH, height=FRAME_HEIGHT, border_px=BORDER_PX,
+                            k1=SETTINGS.barrel_k1, k2=SETTINGS.barrel_k2)
 
     # Start thermal thread
     threading.Thread(target=thermal_thread_worker, daemon=True).start()
@@ -134,7 +132,7 @@ def main():
                 with thermal_lock:
                     frame = thermal_frame.copy() if thermal_frame is not None else None
 
-            elif current_mode in ["overlay_picam", "overlay_noir"]:
+            elif current_mode in ["overlay_picam", "overlay_picam_noir"]:
                 if cam is None:
                     cam = create_camera("picam" if current_mode == "overlay_picam" else "picam_noir")
                     cam.set_zoom(zoom_factor)
@@ -154,13 +152,13 @@ def main():
                 if isinstance(cam, PiCam):
                     cam.set_zoom(zoom_factor)
                 encoder_message = f"Zoom: {zoom_factor:.1f}x"
-                encoder_timer = 1.0
+                encoder_timer = SETTINGS.encoder_message_time
             elif button_pressed:
                 zoom_factor = 1.0
                 if isinstance(cam, PiCam):
                     cam.set_zoom(zoom_factor)
                 encoder_message = "Zoom reset"
-                encoder_timer = 1.0
+                encoder_timer = SETTINGS.encoder_message_time
 
             # --- Overlay text ---
             text_lines = []
@@ -0,0 +1,263 @@
+import json
+import os
+import time
+from dataclasses import dataclass, field, fields
+
+SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config", "settings.json")
+
+
+CAMERA_MODES = {"picam", "picam_noir", "thermal", "overlay_picam", "overlay_picam_noir"}
+
+
+def _default_switch_map():
+    return {
+        1: "picam",
+        2: "picam_noir",
+        3: "thermal",
+        4: "overlay_picam",       # PiCam + Thermal overlay
+        5: "overlay_picam_noir",  # PiCam NoIR + Thermal overlay
+    }
+
+
+@dataclass
+class Settings:
+    """All headset tunables. Values come from config/settings.json, defaults from here."""
+
+    # Display
+    frame_width: int = 800
+    frame_height: int = 480
+    border_px: int = 10
+    barrel_k1: float = -0.25
+    barrel_k2: float = 0.0
+
+    # Encoder
+    zoom_step: float = 0.1              # per encoder tick
+    encoder_message_time: float = 1.0   # seconds
+
+    # FOV (approximate, horizontal)
+    fov_picam: float = 75.0
+    fov_thermal: float = 55.0
+
+    # Overlay blend weights
+    overlay_alpha_picam: float = 0.7
+    overlay_alpha_thermal: float = 0.3
+    align_debug: bool = False
+
+    # Thermal image
+    thermal_colormap: str = "TURBO"     # any cv2.COLORMAP_* name
+    thermal_invert: bool = True
+    thermal_smoothing: bool = True
+    smoothing_kernel: tuple = (5, 5)
+    smoothing_sigma: float = 1.5
+    thermal_update_interval: int = 10   # update thermal once every N PiCam frames
+
+    # PiCam auto-exposure settle time after start
+    picam_warmup: float = 0.0
+
+    # Quality governor (steps quality down when hot, throttled or slow)
+    governor_enabled: bool = True
+    governor_target_fps: float = 25.0
+    governor_temp_high: float = 75.0    # °C, the Pi starts soft throttling at 80
+    governor_temp_low: float = 65.0
+    # Last-resort step that halves the capture resolution. It reopens the
+    # cameras, a multi-second outage every time it is entered or left.
+    governor_capture_scale: bool = False
+
+    # Web preview
+    web_preview: bool = False
+    web_port: int = 8000
+    web_status_interval: float = 1.0    # seconds
+
+    # Map switch positions to camera modes
+    switch_camera_map: dict = field(default_factory=_default_switch_map)
+
+    def update(self, other):
+        """Copy values from another Settings in place; return the names that changed."""
+        changed = set()
+        for f in fields(self):
+            value = getattr(other, f.name)
+            if getattr(self, f.name) != value:
+                setattr(self, f.name, value)
+                changed.add(f.name)
+        return changed
+
+
+def _coerce(name, value, default):
+    """Convert a JSON value to the type of the field's default, or raise ValueError."""
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError(f"{name}: expected true/false, got {value!r}")
+        return value
+    if isinstance(default, int) and not isinstance(default, bool):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{name}: expected an integer, got {value!r}")
+        return value
+    if isinstance(default, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{name}: expected a number, got {value!r}")
+        return float(value)
+    if isinstance(default, str):
+        if not isinstance(value, str):
+            raise ValueError(f"{name}: expected a string, got {value!r}")
+        return value
+    if isinstance(default, tuple):
+        if not isinstance(value, list) or len(value) != len(default):
+            raise ValueError(f"{name}: expected a list of {len(default)} values, got {value!r}")
+        return tuple(_coerce(name, v, d) for v, d in zip(value, default))
+    if isinstance(default, dict):
+        if not isinstance(value, dict):
+            raise ValueError(f"{name}: expected an object, got {value!r}")
+        try:
+            return {int(k): str(v) for k, v in value.items()}
+        except ValueError:
+            raise ValueError(f"{name}: keys must be switch positions, got {list(value)}")
+    return value
+
+
+def _odd_kernel(kernel):
+    return all(k > 0 and k % 2 == 1 for k in kernel)
+
+
+# Value ranges, checked after type coercion. A value outside them would
+# crash or blank the render loop, so a hot reload must reject it.
+RANGES = {
+    "frame_width": (lambda v: v > 0, "must be > 0"),
+    "frame_height": (lambda v: v > 0, "must be > 0"),
+    "border_px": (lambda v: v >= 1, "must be >= 1"),
+    "zoom_step": (lambda v: v > 0, "must be > 0"),
+    "encoder_message_time": (lambda v: v >= 0, "must be >= 0"),
+    "fov_picam": (lambda v: v > 0, "must be > 0"),
+    "fov_thermal": (lambda v: v > 0, "must be > 0"),
+    "overlay_alpha_picam": (lambda v: 0 <= v <= 1, "must be between 0 and 1"),
+    "overlay_alpha_thermal": (lambda v: 0 <= v <= 1, "must be between 0 and 1"),
+    "smoothing_kernel": (_odd_kernel, "must be odd and > 0"),
+    "smoothing_sigma": (lambda v: v >= 0, "must be >= 0"),
+    "thermal_update_interval": (lambda v: v >= 1, "must be >= 1"),
+    "picam_warmup": (lambda v: v >= 0, "must be >= 0"),
+    "governor_target_fps": (lambda v: v > 0, "must be > 0"),
+    "web_port": (lambda v: 0 < v < 65536, "must be a TCP port"),
+    "web_status_interval": (lambda v: v > 0, "must be > 0"),
+    "switch_camera_map": (lambda v: set(v.values()) <= CAMERA_MODES,
+                          f"modes must be one of {sorted(CAMERA_MODES)}"),
+}
+
+
+def _check_ranges(settings):
+    for name, (valid, message) in RANGES.items():
+        value = getattr(settings, name)
+        if not valid(value):
+            raise ValueError(f"{name}: {message}, got {value!r}")
+    if 2 * settings.border_px >= min(settings.frame_width // 2, settings.frame_height):
+        raise ValueError(f"border_px: {settings.border_px} leaves no picture")
+    if settings.governor_temp_low >= settings.governor_temp_high:
+        raise ValueError("governor_temp_low must be below governor_temp_high")
+    if settings.fov_thermal > settings.fov_picam:
+        # The overlay would be scaled larger than the PiCam frame it is blended into
+        raise ValueError("fov_thermal must not be larger than fov_picam")
+
+
+def load_settings(path=SETTINGS_FILE):
+    """Read settings from JSON. Missing keys keep their defaults; bad or out-of-range values raise ValueError."""
+    settings = Settings()
+    try:
+        with open(path) as f:
+            text = f.read()
+    except FileNotFoundError:
+        return settings
+    if not text.strip():
+        return settings
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: {e}")
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+
+    known = {f.name for f in fields(settings)}
+    for key, value in data.items():
+        if key not in known:
+            print(f"Unknown setting ignored: {key}")
+            continue
+        setattr(settings, key, _coerce(key, value, getattr(settings, key)))
+    _check_ranges(settings)
+    return settings
+
+
+def load_settings_or_defaults(path=SETTINGS_FILE):
+    """load_settings() for startup: a bad file prints why and boots with the defaults."""
+    try:
+        return load_settings(path)
+    except ValueError as e:
+        print(f"Bad settings, using defaults: {e}")
+        return Settings()
+
+
+# Precomputed state and the settings it is derived from
+DEPENDENCIES = {
+    "display": {"border_px", "barrel_k1", "barrel_k2"},
+    "overlay": {"fov_picam", "fov_thermal", "overlay_alpha_picam", "overlay_alpha_thermal", "align_debug"},
+    "colormap": {"thermal_colormap", "thermal_invert"},
+    "governor": {"governor_target_fps", "governor_temp_high", "governor_temp_low", "governor_capture_scale"},
+}
+
+# Settings that are only read at startup
+RESTART_REQUIRED = {"frame_width", "frame_height", "web_preview", "web_port", "governor_enabled"}
+
+
+def affected(changed):
+    """Names of the precomputed states that must be rebuilt after `changed` settings."""
+    return {name for name, deps in DEPENDENCIES.items() if deps & changed}
+
+
+class SettingsWatcher:
+    """
+    Hot reload for a Settings object. poll() is cheap (one stat() per interval)
+    and is meant to be called from the render loop, so settings never change
+    in the middle of a frame.
+    """
+
+    def __init__(self, settings, path=SETTINGS_FILE, interval=1.0):
+        self.settings = settings
+        self.path = path
+        self.interval = interval
+        self._last_check = 0.0
+        self._mtime = self._stat()
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self):
+        """Reload if the file changed; return the names of the settings that changed."""
+        now = time.time()
+        if now - self._last_check < self.interval:
+            return set()
+        self._last_check = now
+
+        mtime = self._stat()
+        if mtime == self._mtime:
+            return set()
+        self._mtime = mtime
+
+        try:
+            new = load_settings(self.path)
+        except ValueError as e:
+            print(f"Settings not reloaded: {e}")
+            return set()
+
+        # Keep startup-only settings as they are until the next restart
+        ignored = set()
+        for name in RESTART_REQUIRED:
+            if getattr(new, name) != getattr(self.settings, name):
+                setattr(new, name, getattr(self.settings, name))
+                ignored.add(name)
+        if ignored:
+            print(f"Restart required to apply: {', '.join(sorted(ignored))}")
+
+        changed = self.settings.update(new)
+        if changed:
+            print(f"Settings reloaded: {', '.join(sorted(changed))}")
+        return changed
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules under src/ import each other as top-level modules (e.g. `from frame_ring import FrameRing`)
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
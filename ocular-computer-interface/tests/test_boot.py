@@ -0,0 +1,19 @@
+import os
+import time
+
+import pytest
+
+from boot import StartupProfiler, process_age
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="needs /proc")
+def test_profiler_measures_from_process_start():
+    age = process_age()
+    assert age is not None and age > 0
+
+    profiler = StartupProfiler()
+    name, duration, at = profiler.phases[0]
+    assert name == "interpreter + imports"
+    # The reference is before the profiler was created, by the process age
+    assert time.perf_counter() - profiler.start >= duration
+    assert at == duration
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from frame_ring import FrameRing
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing(shape=(4, 6, 3), slots=3, create=True)
+    yield ring
+    ring.close()
+
+
+def frame(value, shape=(4, 6, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def test_empty_ring_has_no_frame(ring):
+    assert ring.latest_view() is None
+    assert ring.read() == (None, 0)
+
+
+def test_read_returns_newest_frame(ring):
+    for value in range(1, 6):
+        ring.write(frame(value))
+    data, count = ring.read()
+    assert count == 5
+    assert (data == 5).all()
+
+
+def test_smaller_frames_fit_and_larger_are_rejected(ring):
+    ring.write(frame(7, (2, 3, 3)))
+    data, _ = ring.read()
+    assert data.shape == (2, 3, 3)
+    with pytest.raises(ValueError):
+        ring.write(frame(1, (5, 6, 3)))
+
+
+def test_overwritten_view_is_no_longer_valid(ring):
+    ring.write(frame(1))
+    view, slot, seq, _ = ring.latest_view()
+    assert ring.still_valid(slot, seq)
+    for value in range(2, 2 + ring.slots):
+        ring.write(frame(value))  # laps the ring and reuses the leased slot
+    assert not ring.still_valid(slot, seq)
+
+
+def test_slot_in_progress_is_skipped(ring):
+    ring.write(frame(1))
+    view, slot, seq, _ = ring.latest_view()
+    ring._slot_header(slot)[0] += 1  # writer is half-way through this slot
+    assert ring.latest_view() is None
+    assert not ring.still_valid(slot, seq)
+
+
+def test_writer_killed_mid_write_does_not_break_slot(ring):
+    attached = FrameRing(name=ring.name, shape=ring.shape, slots=ring.slots)
+    try:
+        # Simulate a writer that died between the two sequence increments
+        attached._slot_header(attached.count % attached.slots)[0] += 1
+
+        readable = 0
+        for value in range(1, 10):
+            attached.write(frame(value))
+            data, count = ring.read()
+            if data is not None and (data == value).all():
+                readable += 1
+        assert readable == 9
+        for slot in range(ring.slots):
+            assert int(ring._slot_header(slot)[0]) % 2 == 0
+    finally:
+        attached.close()
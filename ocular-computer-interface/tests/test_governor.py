@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+
+from governor import (
+    CAPTURE_LEVEL,
+    CAPTURE_LEVEL_MIN_TIME,
+    BackgroundSensor,
+    FakeSensor,
+    QualityGovernor,
+)
+
+HOT = (80.0, 0, 1500.0)
+COOL = (50.0, 0, 1500.0)
+WARM = (70.0, 0, 1500.0)          # between temp_low and temp_high
+THROTTLED = (50.0, 0x4, 600.0)
+
+FAST = 1 / 100   # frame time well above the 25 fps target
+SLOW = 1 / 10
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_governor(readings, **kwargs):
+    clock = Clock()
+    governor = QualityGovernor(FakeSensor(readings), target_fps=25, temp_high=75, temp_low=65,
+                               interval=1.0, hold=4.0, clock=clock, **kwargs)
+    return governor, clock
+
+
+def run(governor, clock, seconds, frame_time=FAST, step=0.5):
+    changes = []
+    for _ in range(int(seconds / step)):
+        clock.now += step
+        if governor.update(frame_time):
+            changes.append((clock.now, governor.level))
+    return changes
+
+
+@pytest.mark.parametrize("reading, frame_time", [(HOT, FAST), (THROTTLED, FAST), (COOL, SLOW)])
+def test_steps_down_under_pressure(reading, frame_time):
+    governor, clock = make_governor([reading])
+    changes = run(governor, clock, 3.5, frame_time)
+    assert changes == []  # the condition has not held for `hold` seconds yet
+
+    changes = run(governor, clock, 30, frame_time)
+    assert [level for _, level in changes] == [1, 2, 3]
+    # One step per hold period
+    times = [t for t, _ in changes]
+    assert all(b - a >= 4.0 for a, b in zip(times, times[1:]))
+
+
+def test_capture_step_is_off_by_default():
+    governor, clock = make_governor([HOT])
+    run(governor, clock, 60)
+    assert governor.level == CAPTURE_LEVEL - 1
+    assert governor.quality["capture_scale"] == 1.0
+
+
+def test_steps_up_slower_than_down():
+    governor, clock = make_governor([HOT] * 20 + [COOL])
+    down = run(governor, clock, 20)
+    assert governor.level == 3
+
+    up = run(governor, clock, 60)
+    assert [level for _, level in up] == [2, 1, 0]
+    down_times = [t for t, _ in down]
+    up_times = [t for t, _ in up]
+    assert min(b - a for a, b in zip(up_times, up_times[1:])) > \
+        max(b - a for a, b in zip(down_times, down_times[1:]))
+
+
+def test_mixed_conditions_reset_both_timers():
+    # Hot for 3 s, then warm and fast (neither pressure nor headroom), then hot again
+    governor, clock = make_governor([HOT] * 3 + [WARM] + [HOT])
+    run(governor, clock, 3.0)
+    run(governor, clock, 1.0)  # warm sample resets the pressure timer
+    changes = run(governor, clock, 3.5)
+    assert changes == []  # a continuous 4 s of pressure is needed again
+    changes = run(governor, clock, 1.0)
+    assert [level for _, level in changes] == [1]
+
+
+def test_warm_does_not_step_up():
+    governor, clock = make_governor([HOT] * 10 + [WARM])
+    run(governor, clock, 10)
+    level = governor.level
+    assert level > 0
+    run(governor, clock, 60)
+    assert governor.level == level
+
+
+def test_capture_level_is_held_before_stepping_up():
+    governor, clock = make_governor([HOT] * 30 + [COOL], allow_capture_scale=True)
+    down = run(governor, clock, 30)
+    assert governor.level == CAPTURE_LEVEL
+    entered = down[-1][0]
+
+    changes = run(governor, clock, CAPTURE_LEVEL_MIN_TIME + 10)
+    assert changes[0][1] == CAPTURE_LEVEL - 1
+    assert changes[0][0] - entered >= CAPTURE_LEVEL_MIN_TIME
+
+
+def test_background_sensor_does_not_block():
+    release = threading.Event()
+
+    class SlowSensor:
+        def read(self):
+            release.wait(5)
+            return HOT
+
+    sensor = BackgroundSensor(SlowSensor(), interval=0.01)
+    try:
+        assert sensor.read() == (None, 0, None)  # returns immediately with no sample yet
+        release.set()
+        for _ in range(100):
+            if sensor.read() == HOT:
+                break
+            threading.Event().wait(0.01)
+        assert sensor.read() == HOT
+    finally:
+        sensor.stop()
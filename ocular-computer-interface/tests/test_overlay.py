@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from display.overlay import ThermalOverlay
+from settings import Settings
+
+
+@pytest.mark.parametrize("fov_thermal", [55.0, 80.0, 0.1])
+def test_overlay_roi_stays_inside_the_frame(fov_thermal):
+    # fov_thermal > fov_picam is rejected by load_settings, but the overlay must not crash on it
+    overlay = ThermalOverlay(Settings(fov_picam=75.0, fov_thermal=fov_thermal))
+    picam = np.zeros((48, 80, 3), np.uint8)
+    thermal = np.full((48, 80, 3), 255, np.uint8)
+
+    frame = overlay.apply(picam, thermal)
+
+    assert frame.shape == picam.shape
+    new_w, new_h = overlay.size
+    assert 1 <= new_w <= 80 and 1 <= new_h <= 48
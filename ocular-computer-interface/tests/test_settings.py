@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from settings import (
+    RESTART_REQUIRED, Settings, SettingsWatcher, _coerce, affected, load_settings, load_settings_or_defaults,
+)
+
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_missing_or_empty_file_gives_defaults(tmp_path):
+    assert load_settings(str(tmp_path / "missing.json")) == Settings()
+    (tmp_path / "empty.json").write_text("")
+    assert load_settings(str(tmp_path / "empty.json")) == Settings()
+
+
+def test_values_are_coerced_to_field_types(tmp_path):
+    settings = load_settings(write(tmp_path / "s.json", {
+        "fov_picam": 70,
+        "smoothing_kernel": [3, 7],
+        "switch_camera_map": {"1": "thermal"},
+    }))
+    assert settings.fov_picam == 70.0 and isinstance(settings.fov_picam, float)
+    assert settings.smoothing_kernel == (3, 7)
+    assert settings.switch_camera_map == {1: "thermal"}
+
+
+@pytest.mark.parametrize("name, value, default", [
+    ("align_debug", 1, False),
+    ("border_px", 2.5, 10),
+    ("border_px", True, 10),
+    ("fov_picam", "75", 75.0),
+    ("smoothing_kernel", [5], (5, 5)),
+    ("switch_camera_map", {"one": "picam"}, {1: "picam"}),
+])
+def test_coerce_rejects_wrong_types(name, value, default):
+    with pytest.raises(ValueError):
+        _coerce(name, value, default)
+
+
+@pytest.mark.parametrize("data", [
+    {"thermal_update_interval": 0},
+    {"fov_picam": 0},
+    {"fov_thermal": -5},
+    {"fov_thermal": 80.0},
+    {"smoothing_kernel": [4, 4]},
+    {"smoothing_kernel": [0, 5]},
+    {"border_px": 0},
+    {"border_px": 200},
+    {"overlay_alpha_thermal": 1.5},
+    {"governor_target_fps": 0},
+    {"governor_temp_low": 80.0},
+    {"switch_camera_map": {"1": "infrared"}},
+])
+def test_out_of_range_values_are_rejected(tmp_path, data):
+    with pytest.raises(ValueError):
+        load_settings(write(tmp_path / "s.json", data))
+
+
+def test_bad_file_at_startup_falls_back_to_defaults(tmp_path):
+    (tmp_path / "s.json").write_text("{not json")
+    assert load_settings_or_defaults(str(tmp_path / "s.json")) == Settings()
+    assert load_settings_or_defaults(write(tmp_path / "r.json", {"border_px": 0})) == Settings()
+
+
+def test_affected_maps_settings_to_caches():
+    assert affected({"barrel_k1"}) == {"display"}
+    assert affected({"fov_thermal", "thermal_colormap"}) == {"overlay", "colormap"}
+    assert affected({"zoom_step"}) == set()
+
+
+def test_watcher_applies_changes_in_place(tmp_path):
+    path = write(tmp_path / "s.json", {})
+    settings = load_settings(path)
+    watcher = SettingsWatcher(settings, path, interval=0)
+    assert watcher.poll() == set()
+
+    write(tmp_path / "s.json", {"fov_thermal": 50.0, "zoom_step": 0.2})
+    watcher._mtime = None  # the rewrite may land in the same mtime tick
+    assert watcher.poll() == {"fov_thermal", "zoom_step"}
+    assert settings.fov_thermal == 50.0
+
+
+def test_watcher_keeps_restart_required_values(tmp_path):
+    path = write(tmp_path / "s.json", {})
+    settings = load_settings(path)
+    watcher = SettingsWatcher(settings, path, interval=0)
+
+    write(tmp_path / "s.json", {"frame_width": 640, "web_port": 9000, "border_px": 5})
+    watcher._mtime = None
+    assert watcher.poll() == {"border_px"}
+    assert settings.frame_width == 800
+    assert settings.web_port == 8000
+    assert RESTART_REQUIRED >= {"frame_width", "web_port"}
+
+
+def test_watcher_rejects_bad_file_and_keeps_settings(tmp_path):
+    path = write(tmp_path / "s.json", {})
+    settings = load_settings(path)
+    watcher = SettingsWatcher(settings, path, interval=0)
+
+    write(tmp_path / "s.json", {"thermal_update_interval": 0, "zoom_step": 0.5})
+    watcher._mtime = None
+    assert watcher.poll() == set()
+    assert settings == Settings()
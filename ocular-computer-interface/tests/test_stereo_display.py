@@ -0,0 +1,44 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from display import splash, stereo_display
+from display.stereo_display import StereoDisplay
+
+
+@pytest.fixture
+def display(tmp_path, monkeypatch):
+    monkeypatch.setattr(splash, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(stereo_display, "CACHE_DIR", str(tmp_path))
+    # Skip __init__, which opens /dev/fb0
+    display = StereoDisplay.__new__(StereoDisplay)
+    display.width, display.height, display.border_px = 80, 48, 2
+    display.interpolation = cv2.INTER_LINEAR
+    display.k1 = display.k2 = None
+    display.set_distortion(-0.25, 0.0)
+    return display
+
+
+def test_barrel_map_is_loaded_from_cache(display, tmp_path):
+    cached = display._load_barrel_map(40, 48, -0.25, 0.0)
+    assert np.array_equal(cached[0], display.map_x)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_old_barrel_maps_are_pruned(display, tmp_path):
+    for i in range(stereo_display.MAX_CACHED_MAPS + 3):
+        display.set_distortion(-0.1 * i, 0.0)
+    assert len(list(tmp_path.glob("barrel_*.npz"))) == stereo_display.MAX_CACHED_MAPS
+
+
+def test_splash_follows_geometry(display, tmp_path):
+    display.save_splash()
+    first = splash.splash_file(80, 48, -0.25, 0.0)
+    assert os.path.getsize(first) == 80 * 48 * 2
+
+    display.set_distortion(-0.2, 0.0)
+    display.save_splash()
+    assert os.path.exists(splash.splash_file(80, 48, -0.2, 0.0))
+    assert not os.path.exists(first)
@@ -0,0 +1,91 @@
+import multiprocessing as mp
+import socket
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from frame_ring import FrameRing
+from web import server
+from web.server import (
+    AdaptiveQuality,
+    JPEG_QUALITY_MAX,
+    JPEG_QUALITY_MIN,
+    JPEG_QUALITY_STEP,
+    STREAM_SCALES,
+)
+
+
+def test_slow_client_lowers_quality_before_resolution():
+    quality = AdaptiveQuality(target_fps=10)
+    steps = (JPEG_QUALITY_MAX - JPEG_QUALITY_MIN + JPEG_QUALITY_STEP - 1) // JPEG_QUALITY_STEP
+    for _ in range(steps):
+        quality.update(1.0)
+        assert quality.scale == 1.0
+    assert quality.quality == JPEG_QUALITY_MIN
+
+    for _ in range(len(STREAM_SCALES) + 2):
+        quality.update(1.0)
+    assert quality.scale == STREAM_SCALES[-1]
+    assert quality.quality == JPEG_QUALITY_MIN
+
+
+def test_fast_client_restores_resolution_then_quality():
+    quality = AdaptiveQuality(target_fps=10)
+    for _ in range(20):
+        quality.update(1.0)
+
+    quality.update(0.0)
+    assert quality.scale == STREAM_SCALES[-2]
+    assert quality.quality == JPEG_QUALITY_MIN
+
+    for _ in range(20):
+        quality.update(0.0)
+    assert quality.scale == 1.0
+    assert quality.quality == JPEG_QUALITY_MAX
+
+
+def test_send_time_within_budget_keeps_settings():
+    quality = AdaptiveQuality(target_fps=10)
+    quality.update(1.0)
+    before = (quality.quality, quality.scale)
+    quality.update(0.07)  # between half the budget and the budget
+    assert (quality.quality, quality.scale) == before
+
+
+def test_encode_applies_scale():
+    quality = AdaptiveQuality()
+    quality.scale_idx = len(STREAM_SCALES) - 1
+    frame = np.zeros((480, 800, 3), dtype=np.uint8)
+    jpeg = quality.encode(frame)
+    assert jpeg[:2] == b"\xff\xd8"
+    decoded = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape[:2] == (int(480 * STREAM_SCALES[-1]), int(800 * STREAM_SCALES[-1]))
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stream_notices_disconnect_while_nothing_is_published(monkeypatch):
+    monkeypatch.setattr(server, "KEEPALIVE_INTERVAL", 0.05)
+    ring = FrameRing(shape=(48, 64, 3), slots=2, create=True)
+    httpd = server.make_server(ring, mp.Array("c", 64), "127.0.0.1", 0, 15)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        client = socket.create_connection(httpd.server_address)
+        client.sendall(b"GET /stream.mjpg HTTP/1.1\r\nHost: test\r\n\r\n")
+        assert b"multipart/x-mixed-replace" in client.recv(4096)
+        assert wait_for(lambda: httpd.clients == 1)
+
+        # No frame is ever published; only the keep-alive writes can fail
+        client.close()
+        assert wait_for(lambda: httpd.clients == 0)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        ring.close()
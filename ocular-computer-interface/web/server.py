@@ -0,0 +1,307 @@
+import json
+import os
+import sys
+import threading
+import time
+import multiprocessing as mp
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from frame_ring import FrameRing
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# --- SETTINGS ---
+STATUS_BYTES = 4096
+MAX_STREAM_FPS = 15
+POLL_INTERVAL = 0.005
+KEEPALIVE_INTERVAL = 1.0  # seconds without a new frame before the last one is re-sent
+
+# JPEG quality / resolution steps used by AdaptiveQuality
+JPEG_QUALITY_MAX = 85
+JPEG_QUALITY_MIN = 35
+JPEG_QUALITY_STEP = 10
+STREAM_SCALES = (1.0, 0.75, 0.5)
+
+BOUNDARY = "frame"
+
+
+class AdaptiveQuality:
+    """
+    Per-client JPEG quality and resolution. If sending a frame takes longer
+    than the frame budget the quality drops first, then the resolution;
+    when the client keeps up easily both are raised again.
+    """
+
+    def __init__(self, target_fps=MAX_STREAM_FPS):
+        self.budget = 1.0 / target_fps
+        self.quality = JPEG_QUALITY_MAX
+        self.scale_idx = 0
+
+    @property
+    def scale(self):
+        return STREAM_SCALES[self.scale_idx]
+
+    def update(self, send_time):
+        if send_time > self.budget:
+            if self.quality > JPEG_QUALITY_MIN:
+                self.quality = max(JPEG_QUALITY_MIN, self.quality - JPEG_QUALITY_STEP)
+            elif self.scale_idx < len(STREAM_SCALES) - 1:
+                self.scale_idx += 1
+        elif send_time < self.budget / 2:
+            if self.scale_idx > 0:
+                self.scale_idx -= 1
+            elif self.quality < JPEG_QUALITY_MAX:
+                self.quality = min(JPEG_QUALITY_MAX, self.quality + JPEG_QUALITY_STEP)
+
+    def encode(self, frame):
+        if self.scale != 1.0:
+            h, w = frame.shape[:2]
+            frame = cv2.resize(frame, (int(w * self.scale), int(h * self.scale)),
+                               interpolation=cv2.INTER_AREA)
+        # Frames are RGB in the render loop, JPEG encoder expects BGR
+        bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        ok, jpeg = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        return jpeg.tobytes() if ok else None
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path in ("/", "/index.html"):
+            self._send_file(os.path.join(STATIC_DIR, "index.html"), "text/html")
+        elif self.path == "/status":
+            self._send_status()
+        elif self.path == "/stream.mjpg":
+            self._send_stream()
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet, the render loop prints there
+
+    def _send_file(self, path, content_type):
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_status(self):
+        raw = self.server.status.value
+        try:
+            status = json.loads(raw.decode()) if raw else {}
+        except ValueError:
+            status = {}
+        status["clients"] = self.server.clients
+        body = json.dumps(status).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self):
+        self.send_response(200)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.end_headers()
+
+        ring = self.server.ring
+        quality = AdaptiveQuality(self.server.max_fps)
+        min_interval = 1.0 / self.server.max_fps
+        last_count = 0
+        last_sent = time.time()
+        last_jpeg = None
+        self._add_client(1)
+        try:
+            while True:
+                # Nothing published for a while (camera switch, no camera open):
+                # write anyway, otherwise a client that went away is never noticed.
+                # Before the first frame a blank line is valid multipart preamble.
+                if time.time() - last_sent >= KEEPALIVE_INTERVAL:
+                    if last_jpeg is None:
+                        self.wfile.write(b"\r\n")
+                        self.wfile.flush()
+                    else:
+                        self._write_part(last_jpeg)
+                    last_sent = time.time()
+
+                # Per-client frame skipping: always take the newest frame, a
+                # slow client simply misses the ones in between
+                if ring.count == last_count or time.time() - last_sent < min_interval:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                frame, count = ring.read()
+                if frame is None:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                last_count = count
+
+                start = time.time()
+                jpeg = quality.encode(frame)
+                if jpeg is None:
+                    continue
+                self._write_part(jpeg)
+                last_jpeg = jpeg
+                last_sent = time.time()
+                quality.update(last_sent - start)
+        except ConnectionError:
+            pass
+        finally:
+            self._add_client(-1)
+
+    def _write_part(self, jpeg):
+        self.wfile.write(
+            f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+            f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+        )
+        self.wfile.write(jpeg)
+        self.wfile.write(b"\r\n")
+
+    def _add_client(self, delta):
+        # Handler threads connect and disconnect concurrently
+        with self.server.clients_lock:
+            self.server.clients += delta
+
+
+def make_server(ring, status, host, port, max_fps):
+    httpd = ThreadingHTTPServer((host, port), PreviewHandler)
+    httpd.daemon_threads = True
+    httpd.ring = ring
+    httpd.status = status
+    httpd.clients = 0
+    httpd.clients_lock = threading.Lock()
+    httpd.max_fps = max_fps
+    return httpd
+
+
+def serve(ring_name, shape, slots, status, host, port, max_fps):
+    """Server process entry point. Attaches to the ring created by the render process."""
+    ring = FrameRing(name=ring_name, shape=shape, slots=slots)
+    httpd = make_server(ring, status, host, port, max_fps)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        ring.close()
+
+
+class PreviewServer:
+    """
+    Live preview of the composited frame over HTTP.
+
+    The render loop only copies each frame into a shared-memory ring; JPEG
+    encoding and client I/O happen in a separate process, so they never hold
+    the render process's GIL.
+    """
+
+    def __init__(self, width=800, height=480, host="0.0.0.0", port=8000,
+                 slots=3, max_fps=MAX_STREAM_FPS):
+        shape = (height, width, 3)
+        self.ring = FrameRing(shape=shape, slots=slots, create=True)
+        self.status = mp.Array("c", STATUS_BYTES)
+        self.process = mp.Process(
+            target=serve,
+            args=(self.ring.name, shape, slots, self.status, host, port, max_fps),
+            daemon=True,
+        )
+        self.publish_time = 0.0
+        self.published = 0
+
+    def start(self):
+        self.process.start()
+
+    def publish(self, frame):
+        start = time.perf_counter()
+        self.ring.write(frame)
+        self.publish_time += time.perf_counter() - start
+        self.published += 1
+
+    @property
+    def publish_ms(self):
+        """Average time the render loop spends per published frame."""
+        return 1000.0 * self.publish_time / self.published if self.published else 0.0
+
+    def set_status(self, **status):
+        status["publish_ms"] = round(self.publish_ms, 3)
+        raw = json.dumps(status).encode()[:STATUS_BYTES - 1]
+        self.status.value = raw
+
+    def stop(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1.0)
+        self.ring.close()
+
+
+def benchmark(seconds=5.0, width=800, height=480, port=8000):
+    """Compare render FPS of a synthetic loop with and without the preview server."""
+    import threading
+    import urllib.request
+    import numpy as np
+
+    frame = np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
+    map_x = np.random.uniform(0, width - 1, (height, width)).astype(np.float32)
+    map_y = np.random.uniform(0, height - 1, (height, width)).astype(np.float32)
+
+    def render_loop(server=None):
+        frames = 0
+        end = time.time() + seconds
+        while time.time() < end:
+            out = cv2.remap(frame, map_x, map_y, interpolation=cv2.INTER_LINEAR)
+            if server:
+                server.publish(out)
+            frames += 1
+        return frames / seconds
+
+    baseline = render_loop()
+
+    server = PreviewServer(width=width, height=height, host="127.0.0.1", port=port)
+    server.start()
+    time.sleep(0.5)
+
+    received = [0]
+
+    def client():
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/stream.mjpg") as stream:
+                while True:
+                    line = stream.readline()
+                    if not line:
+                        break
+                    if line.startswith(b"Content-Length:"):
+                        received[0] += 1
+        except OSError:
+            pass
+
+    threading.Thread(target=client, daemon=True).start()
+    try:
+        streamed = render_loop(server)
+    finally:
+        server.stop()
+
+    print(f"Render FPS without server: {baseline:.1f}")
+    print(f"Render FPS with server:    {streamed:.1f} ({100 * (1 - streamed / baseline):.1f}% overhead)")
+    print(f"Publish cost: {server.publish_ms:.3f} ms/frame, client received {received[0]} frames")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        print("The preview is started by main.py (WEB_PREVIEW = True); use --bench to measure overhead")